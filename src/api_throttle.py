@@ -7,10 +7,11 @@ class APIThrottle:
 
     This class keeps track of the time since the last API request, the total time elapsed between calls,
     and the number of calls made, to calculate the average time between API requests.
+    Intervals are measured with the monotonic clock, so wall clock adjustments do not affect them.
 
     Attributes:
         request_interval_ms (int): The minimum interval between API requests in milliseconds.
-        last_request_time_ns (int): The timestamp of the last API request in nanoseconds.
+        last_request_time_ns (int): The monotonic timestamp of the last API request in nanoseconds.
         total_entry_interval_ms (int): The total time accumulated between calls in milliseconds.
         call_count (int): The number of calls made.
     """
@@ -23,7 +24,7 @@ class APIThrottle:
             request_interval_ms (int): The minimum interval between API requests in milliseconds.
         """
         self.request_interval_ms = request_interval_ms
-        self.last_request_time_ns = time.time_ns()
+        self.last_request_time_ns = time.monotonic_ns()
         self.previous_entry_time_ns = self.last_request_time_ns
         self.total_entry_interval_ms = 0
         self.call_count = 0
@@ -37,7 +38,7 @@ class APIThrottle:
         tracking, increments the call count, and if necessary, sleeps for the remaining time
         until the next request can be made.
         """
-        current_entry_time_ns = time.time_ns()
+        current_entry_time_ns = time.monotonic_ns()
         if self.call_count > 0:  # Skip for the first call
             interval_since_last_entry_ms = (current_entry_time_ns - self.previous_entry_time_ns) // 1_000_000
             self.total_entry_interval_ms += interval_since_last_entry_ms
@@ -47,7 +48,7 @@ class APIThrottle:
         if wait_time_ns > 0:
             time.sleep(wait_time_ns / 1_000_000_000)  # Convert ns to seconds
 
-        self.last_request_time_ns = time.time_ns()  # Update last request time
+        self.last_request_time_ns = time.monotonic_ns()  # Update last request time
         self.previous_entry_time_ns = current_entry_time_ns  # Update the entry time for the next call
 
     def report(self) -> float:
@@ -1,10 +1,13 @@
+import atexit
 import logging
+import queue
 import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 from src import lambda_api
 
@@ -43,6 +46,7 @@ class Config(BaseModel):
     start_time_str: str = Field(default_factory=str)
     log_file: Path = Field(default_factory=lambda: Path(datetime.now().strftime("%Y%m%d_%H%M%S.log")), frozen=True)
     new_logged_regions: set = Field(default_factory=set)
+    _log_listener: Optional[QueueListener] = PrivateAttr(default=None)
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -105,15 +109,24 @@ class Config(BaseModel):
         """
         Sets up logging based on the configuration.
 
-        Configures the basic logging setup with the filename, log level,
-        and format as specified in the configuration.
+        Log records are put on a queue by the polling thread and written to the
+        log file by a background QueueListener, so file I/O never blocks a poll.
         """
-        logging.basicConfig(
-            filename=self.log_dir / self.log_file,
-            level=logging.INFO,
-            format="%(asctime)s.%(msecs)03d - %(levelname)s - %(message)s",
+        file_handler = logging.FileHandler(self.log_dir / self.log_file)
+        file_handler.setFormatter(logging.Formatter(
+            fmt="%(asctime)s.%(msecs)03d - %(levelname)s - %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S",
-        )
+        ))
+
+        log_queue = queue.Queue(-1)
+        root_logger = logging.getLogger()
+        root_logger.addHandler(QueueHandler(log_queue))
+        root_logger.setLevel(logging.INFO)
+
+        self._log_listener = QueueListener(log_queue, file_handler)
+        self._log_listener.start()
+        # Drain the queue on exit so records logged just before shutdown are written
+        atexit.register(self._log_listener.stop)
 
         print(f"{Config.now_formatted_str()} - Logging to: {self.log_file}")
         logging.info(f"Starting job at: {self.start_time_str}")
@@ -122,6 +135,6 @@ class Config(BaseModel):
     @staticmethod
     def now_formatted_str(input_datetime: Optional[datetime] = None) -> str:
         if input_datetime is not None:
-            return input_datetime.strftime("%Y-%m-%d %H:%M:%S.%f")
+            return input_datetime.isoformat(sep=" ", timespec="microseconds")
         else:
-            return datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+            return datetime.now().isoformat(sep=" ", timespec="microseconds")
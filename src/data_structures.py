@@ -1,17 +1,38 @@
 import json
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import List
+from weakref import WeakValueDictionary
 
 from pydantic import BaseModel, Field
 
 
-class InstanceType(BaseModel):
+# A plain frozen dataclass rather than a Pydantic model: it is the dictionary key in every tracker diff,
+# so hashing and equality should be the generated dataclass methods without Pydantic overhead
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class InstanceType:
     name: str
     description: str
     region: str
 
-    class Config:
-        frozen = True  # Make entire class immutable
+    @classmethod
+    def get_or_create(cls, name: str, description: str, region: str) -> 'InstanceType':
+        """
+        Returns the shared InstanceType for these fields, creating it if needed.
+
+        Each poll parses new API data; reusing one object per instance type lets the
+        tracker's dictionary lookups match by identity before falling back to equality.
+        """
+        key = (name, description, region)
+        instance_type = _INSTANCE_TYPES.get(key)
+        if instance_type is None:
+            instance_type = cls(name=name, description=description, region=region)
+            _INSTANCE_TYPES[key] = instance_type
+        return instance_type
+
+
+# Interned InstanceTypes keyed by (name, description, region); entries are dropped once nothing references them
+_INSTANCE_TYPES: WeakValueDictionary = WeakValueDictionary()
 
 
 class InstanceAvailability(BaseModel):
@@ -37,7 +58,7 @@ class InstanceAvailability(BaseModel):
         for instance_details in data['data'].values():
             instance_info_data = instance_details['instance_type']
             for region in instance_details['regions_with_capacity_available']:
-                instance_info = InstanceType(
+                instance_info = InstanceType.get_or_create(
                     name=instance_info_data['name'],
                     description=instance_info_data['description'],
                     region=region['name']
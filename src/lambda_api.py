@@ -1,6 +1,6 @@
 import logging
 from datetime import datetime
-from typing import Tuple, Dict, Any, List, Optional, Set
+from typing import Tuple, Dict, Any, List, Optional, Set, FrozenSet
 
 import requests
 
@@ -29,6 +29,10 @@ def static_dict_of_known_regions() -> Dict[str, str]:
     }
 
 
+# Known region names, built once for set arithmetic against observed regions
+KNOWN_REGIONS: FrozenSet[str] = frozenset(static_dict_of_known_regions())
+
+
 def fetch_instance_names(api_key: str,
                          api_endpoint: str = "https://cloud.lambdalabs.com/api/v1/instance-types"
                          ) -> set[str]:
@@ -118,7 +122,7 @@ def fetch_instance_availabilities(api_key: str,
             if details.get("regions_with_capacity_available"):
                 instance_info_data = details['instance_type']
                 for region in details['regions_with_capacity_available']:
-                    instance_type = InstanceType(
+                    instance_type = InstanceType.get_or_create(
                         name=instance_info_data['name'],
                         description=instance_info_data['description'],
                         region=region['name']
@@ -1,39 +1,34 @@
 import logging
 import os
-from typing import Set, Dict, Optional
+from typing import Set
 
-from pydantic import BaseModel, PrivateAttr
-
-import lambda_api
-import output_console
-import output_log
-from data_structures import InstanceType, InstanceAvailability
+from src import lambda_api, output_console, output_log
 from src.config import Config
 from src.lambda_api import fetch_instance_availabilities
-from tracker import Tracker
+from src.tracker import Tracker
 
 
 # TODO alert if a new region is observed; not one in the lambda API region dict
 
 
-class Monitor(BaseModel):
+class Monitor:
     """
     Monitor class for tracking and logging the availability of cloud instances.
 
+    A plain slotted class rather than a Pydantic model: the config is validated
+    when it is built, and the monitor itself is never (de)serialized.
+
     Attributes:
         config (Config): The application configuration.
         _tracker (Tracker): The tracker for monitoring instance availability.
     """
-    # Required fields
-    config: Config
-    # Handled in code
-    _tracker: Optional[Tracker] = PrivateAttr(default=None)
+    __slots__ = ("config", "_tracker")
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    def __init__(self, config: Config):
+        self.config = config
 
         # Initialize the tracker
-        self._tracker = Tracker(start_time=self.config.start_time)
+        self._tracker = Tracker(start_time=config.start_time)
 
     def poll(self) -> None:
         """
@@ -62,26 +57,28 @@ class Monitor(BaseModel):
 
         # Log when a region not in the config.static_regions_dict is observed
         # When a new region is observed, it is added to the config.new_logged_regions set to prevent logging it again
-        Monitor._detect_new_regions(self._tracker.current_availabilities,
+        Monitor._detect_new_regions(self._tracker.current_regions,
                                     self.config.new_logged_regions,
                                     self.config.enable_voice_notifications)
 
+        # Flush the console output written during this poll
+        output_console.flush_console()
+
     @staticmethod
-    def _detect_new_regions(availabilities: Dict[InstanceType, InstanceAvailability],
+    def _detect_new_regions(current_regions: Set[str],
                             new_logged_regions: Set[str],
                             enable_voice_notifications: bool
                             ) -> None:
         """
         Detects when a region not in the config.static_regions_dict is observed.
-        """
-        # Get the static regions from the config
-        known_regions = set(lambda_api.static_dict_of_known_regions().keys())
-
-        # Get the current available regions from the InstanceType in availabilities
-        current_available_regions = set([instance.region for instance in availabilities.keys()])
 
+        Args:
+            current_regions (Set[str]): The regions of the currently available instances.
+            new_logged_regions (Set[str]): The new regions already logged; updated in place.
+            enable_voice_notifications (bool): Whether to announce new regions with the OS voice.
+        """
         # Get the new regions
-        new_regions = current_available_regions - known_regions
+        new_regions = current_regions - lambda_api.KNOWN_REGIONS
 
         # Log the new regions
         for region in new_regions:
@@ -1,27 +1,48 @@
+import sys
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Set
 
-from tracker import Tracker
+from src.tracker import Tracker
+
+_AVAILABLE_TEMPLATE = '\r{time} - Available Instances: {names}, Availability Duration: {duration}'
+_UNAVAILABLE_TEMPLATE = '\r{time} - No instances available. ' \
+                        '{last_message}: {reference_time}, Duration {duration_message}: {duration}'
 
 
 def render_console_output(tracker: Tracker) -> None:
     """
     Updates console output with the latest availability information.
+
+    The tracker's last fetch time is used as the current time, so the console
+    shares the single clock read of the poll.
     """
+    has_changes = tracker.has_new_availabilities() or tracker.has_removed_availabilities()
+    # Checked once per poll and passed on, rather than once per check
+    is_tty = sys.stdout.isatty()
+
+    # The carriage return progress line is meaningless when stdout is piped or redirected,
+    # so only render it there when the instance availability changed
+    if not has_changes and not is_tty:
+        return
+
     # Print a newline if there are any changes to the instance availability
     # Prevent printing a newline on the first poll with did_observe_instances
-    if ((tracker.has_new_availabilities() or tracker.has_removed_availabilities())
+    if (has_changes
             and tracker.has_ever_observed_instances
-            and not tracker.is_first_poll):
+            and not tracker.is_first_poll()):
         print()
 
-    # Render the console output
+    # Render the console output; the instance names are only shown while a session is active
+    is_active = tracker.is_session_active()
     render_to_console(
-        is_available=tracker.is_session_active(),
-        instance_names=tracker.get_current_names(),
+        is_available=is_active,
+        instance_names=tracker.get_current_names() if is_active else set(),
         session_start_time=tracker.session_start_time,
         session_end_time=tracker.session_end_time,
         start_time=tracker.start_time,
+        now=tracker.last_fetch_time,
+        is_tty=is_tty,
     )
 
 
@@ -31,17 +52,22 @@ def render_to_console(
         session_start_time: Optional[datetime],
         session_end_time: Optional[datetime],
         start_time: datetime,
+        *,
+        now: Optional[datetime] = None,
+        is_tty: Optional[bool] = None,
 ) -> None:
-    current_time = datetime.now()
+    current_time = now if now is not None else datetime.now()
     if is_available:
-        available_instance_names = set([instance for instance in instance_names])
         duration = current_time - session_start_time
 
-        output = f'\r{current_time:%Y-%m-%d %H:%M:%S.%f} - ' \
-                 f'Available Instances: {available_instance_names}, ' \
-                 f'Availability Duration: {duration}'
+        # Sorted so the displayed order is stable across renders
+        output = _AVAILABLE_TEMPLATE.format(
+            time=_format_time(current_time),
+            names=sorted(instance_names),
+            duration=duration,
+        )
 
-        print(output, end='')
+        _write(output, is_tty)
     else:
         # Determine the reference time and duration message
         if session_start_time is not None:
@@ -59,9 +85,41 @@ def render_to_console(
 
         duration_since_reference = current_time - reference_time
 
-        output = f'\r{current_time:%Y-%m-%d %H:%M:%S.%f} - ' \
-                 f'No instances available. ' \
-                 f'{last_message}: {reference_time:%Y-%m-%d %H:%M:%S.%f}, ' \
-                 f'Duration {duration_message}: {duration_since_reference}'
+        output = _UNAVAILABLE_TEMPLATE.format(
+            time=_format_time(current_time),
+            last_message=last_message,
+            reference_time=_format_time(reference_time),
+            duration_message=duration_message,
+            duration=duration_since_reference,
+        )
+
+        _write(output, is_tty)
+
+
+def flush_console() -> None:
+    """
+    Flushes console output buffered during a poll.
+
+    Called once at the end of each poll so non-interactive sinks get one write per poll.
+    """
+    sys.stdout.flush()
+
+
+def _write(output: str, is_tty: Optional[bool]) -> None:
+    sys.stdout.write(output)
+    # Keep the progress line live on a terminal; other sinks are flushed by flush_console
+    if is_tty is None:
+        is_tty = sys.stdout.isatty()
+    if is_tty:
+        sys.stdout.flush()
 
-        print(output, end='')
+
+@lru_cache(maxsize=4)
+def _format_time(value: datetime) -> str:
+    """
+    Formats a time for console output.
+
+    Cached because the reference time is usually the same across many renders.
+    """
+    # Same string as '%Y-%m-%d %H:%M:%S.%f' for naive times, without going through strftime
+    return value.isoformat(sep=' ', timespec='microseconds')
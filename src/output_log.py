@@ -1,48 +1,83 @@
 import logging
+from itertools import chain
+from typing import Callable, Dict, Iterable, Tuple
 
 from src.data_structures import InstanceAvailability
-from tracker import Tracker
+from src.tracker import Tracker
+
+_AVAILABLE_FORMAT = "Instance Type: %s, Region: %s - Status: %s - Start: %s"
+_UNAVAILABLE_FORMAT = "Instance Type: %s, Region: %s - Status: %s - Start: %s - End: %s - Duration: %s"
 
 
 def log_instance_changes(tracker: Tracker) -> None:
     """
     Logs information for instances that have become available or unavailable.
+
+    All changes of the same status are emitted as a single log record, one line per instance.
     """
-    for instance in tracker.new_availabilities.values():
-        log_instance_info(instance, "Available")
+    _log_batch(tracker.new_availabilities.values(),
+               _AVAILABLE_FORMAT, _available_args, "Available")
+    _log_batch([instance for instance in tracker.removed_availabilities.values() if instance is not None],
+               _UNAVAILABLE_FORMAT, _unavailable_args, "Unavailable")
+
+
+def _log_batch(instances: Iterable[InstanceAvailability],
+               line_format: str,
+               line_args: Callable[[InstanceAvailability, str], Tuple],
+               status: str,
+               ) -> None:
+    lines_args = [line_args(instance, status) for instance in instances]
+    if not lines_args:
+        return
+
+    # Only the format string is joined here; the message is still formatted lazily by logging
+    logging.info("Availability changes:\n" + "\n".join([line_format] * len(lines_args)),
+                 *chain.from_iterable(lines_args))
+
+
+def _available_args(instance_availability: InstanceAvailability, status: str) -> Tuple:
+    instance_info = instance_availability.instance_type
+    return instance_info.name, instance_info.region, status, instance_availability.start_time
+
+
+def _unavailable_args(instance_availability: InstanceAvailability, status: str) -> Tuple:
+    instance_info = instance_availability.instance_type
+    start_time = instance_availability.start_time
+    end_time = instance_availability.last_time_available
+    return instance_info.name, instance_info.region, status, start_time, end_time, end_time - start_time
 
-    for instance in tracker.removed_availabilities.values():
-        if instance is not None:
-            log_instance_info(instance, "Unavailable")
+
+def _log_available(instance_availability: InstanceAvailability, status: str) -> None:
+    logging.info(_AVAILABLE_FORMAT, *_available_args(instance_availability, status))
+
+
+def _log_unavailable(instance_availability: InstanceAvailability, status: str) -> None:
+    logging.info(_UNAVAILABLE_FORMAT, *_unavailable_args(instance_availability, status))
+
+
+def _log_invalid(instance_availability: InstanceAvailability, status: str) -> None:
+    instance_info = instance_availability.instance_type
+    logging.error(
+        "Invalid status for Instance Type: %s, Region: %s - Status: %s - Start: %s - End: %s",
+        instance_info.name, instance_info.region, status,
+        instance_availability.start_time, instance_availability.last_time_available
+    )
+
+
+# Status handlers; any status not listed here is logged as invalid
+_HANDLERS: Dict[str, Callable[[InstanceAvailability, str], None]] = {
+    "Available": _log_available,
+    "Unavailable": _log_unavailable,
+}
 
 
 def log_instance_info(
         instance_availability: InstanceAvailability,
         status: str,
 ) -> None:
-    instance_info = instance_availability.instance_type
-    start_time = instance_availability.start_time
-    end_time = instance_availability.last_time_available
+    """
+    Logs a single instance availability with the given status.
 
-    if status == "Unavailable":
-        duration = end_time - start_time
-        logging.info(
-            f"Instance Type: {instance_info.name}, Region: {instance_info.region} - "
-            f"Status: {status} - "
-            f"Start: {start_time} - "
-            f"End: {end_time} - "
-            f"Duration: {duration}"
-        )
-    elif status == "Available":
-        logging.info(
-            f"Instance Type: {instance_info.name}, Region: {instance_info.region} - "
-            f"Status: {status} - "
-            f"Start: {start_time}"
-        )
-    else:
-        logging.error(f"Invalid status for "
-                      f"Instance Type: {instance_info.name}, "
-                      f"Region: {instance_info.region} - "
-                      f"Status: {status} - "
-                      f"Start: {start_time} - "
-                      f"End: {end_time}")
+    Kept as public API; polling logs through log_instance_changes, which shares the line formats and arguments.
+    """
+    _HANDLERS.get(status, _log_invalid)(instance_availability, status)
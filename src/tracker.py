@@ -1,9 +1,21 @@
 from datetime import datetime
-from typing import Optional, Dict, Set
+from types import MappingProxyType
+from typing import Optional, Dict, Mapping, Set, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from data_structures import InstanceAvailability, InstanceType
+from src.data_structures import InstanceAvailability, InstanceType
+
+# Shared read-only empty mapping for the per-update availabilities, so polls without changes allocate no dicts
+_EMPTY: Mapping = MappingProxyType({})
+
+# Session transitions keyed by (had availabilities, has fetched availabilities).
+# The value names the session time field stamped with the fetch time;
+# combinations not listed leave the session times unchanged.
+_SESSION_TRANSITIONS: Dict[Tuple[bool, bool], str] = {
+    (False, True): "session_start_time",  # Start of a session
+    (True, False): "session_end_time",  # End of a session
+}
 
 
 class Tracker(BaseModel):
@@ -15,9 +27,17 @@ class Tracker(BaseModel):
     session_end_time: Optional[datetime] = Field(default=None)
 
     current_availabilities: Dict[InstanceType, InstanceAvailability] = Field(default_factory=dict)
-    new_availabilities: Dict[InstanceType, InstanceAvailability] = Field(default_factory=dict)
-    updated_availabilities: Dict[InstanceType, InstanceAvailability] = Field(default_factory=dict)
-    removed_availabilities: Dict[InstanceType, InstanceAvailability] = Field(default_factory=dict)
+    new_availabilities: Mapping[InstanceType, InstanceAvailability] = Field(default_factory=dict)
+    updated_availabilities: Mapping[InstanceType, InstanceAvailability] = Field(default_factory=dict)
+    removed_availabilities: Mapping[InstanceType, InstanceAvailability] = Field(default_factory=dict)
+
+    # Regions of the current availabilities, maintained by update()
+    current_regions: Set[str] = Field(default_factory=set)
+
+    # Instance name sets derived from the availability dicts, keyed by dict name;
+    # each entry remembers the dict it was built from, so it is only reused while that dict is still in place
+    _names_cache: Dict[str, Tuple[Mapping[InstanceType, InstanceAvailability], Set[str]]] = \
+        PrivateAttr(default_factory=dict)
 
     def is_first_poll(self) -> bool:
         return self.last_fetch_time is None
@@ -26,16 +46,43 @@ class Tracker(BaseModel):
         return len(self.current_availabilities) > 0
 
     def get_current_names(self) -> Set[str]:
-        return {instance_type.name for instance_type in self.current_availabilities.keys()}
+        return self._get_names("current", self.current_availabilities)
 
     def get_updated_names(self) -> Set[str]:
-        return {instance_type.name for instance_type in self.updated_availabilities.keys()}
+        return self._get_names("updated", self.updated_availabilities)
 
     def get_new_names(self) -> Set[str]:
-        return {instance_type.name for instance_type in self.new_availabilities.keys()}
+        return self._get_names("new", self.new_availabilities)
 
     def get_removed_names(self) -> Set[str]:
-        return {instance_type.name for instance_type in self.removed_availabilities.keys()}
+        return self._get_names("removed", self.removed_availabilities)
+
+    def _get_names(self, key: str, availabilities: Mapping[InstanceType, InstanceAvailability]) -> Set[str]:
+        # The returned set is shared while the dict is unchanged; callers must not modify it.
+        # update() and reset() replace the dicts rather than modifying them, so a replaced dict means stale names.
+        cached = self._names_cache.get(key)
+        if cached is not None and cached[0] is availabilities:
+            return cached[1]
+        names = {instance_type.name for instance_type in availabilities.keys()}
+        self._names_cache[key] = (availabilities, names)
+        return names
+
+    # Availability counts, for callers that only need how many there are and not the names
+    @property
+    def current_count(self) -> int:
+        return len(self.current_availabilities)
+
+    @property
+    def new_count(self) -> int:
+        return len(self.new_availabilities)
+
+    @property
+    def updated_count(self) -> int:
+        return len(self.updated_availabilities)
+
+    @property
+    def removed_count(self) -> int:
+        return len(self.removed_availabilities)
 
     def has_current_availabilities(self) -> bool:
         return len(self.current_availabilities) > 0
@@ -49,6 +96,18 @@ class Tracker(BaseModel):
     def has_removed_availabilities(self) -> bool:
         return len(self.removed_availabilities) > 0
 
+    def reset(self) -> None:
+        # Clear everything observed so far, as if the tracker had just been created; the start time is kept
+        self.has_ever_observed_instances = False
+        self.last_fetch_time = None
+        self.session_start_time = None
+        self.session_end_time = None
+        self.current_availabilities = {}
+        self.new_availabilities = _EMPTY
+        self.updated_availabilities = _EMPTY
+        self.removed_availabilities = _EMPTY
+        self.current_regions = set()
+
     def update(self,
                fetched_availabilities: Dict[InstanceType, InstanceAvailability],
                fetch_time: datetime
@@ -60,41 +119,49 @@ class Tracker(BaseModel):
         if not self.has_ever_observed_instances and len(fetched_availabilities) > 0:
             self.has_ever_observed_instances = True
 
-        # Create dictionaries for new, updated, and removed availabilities
-        self.new_availabilities = {}
-        self.updated_availabilities = {}
-        self.removed_availabilities = {}
-
-        # Update the new and updated availabilities
-        for instance_type, availability in fetched_availabilities.items():
-            # Derive the new availabilities
-            if instance_type not in self.current_availabilities:
-                self.new_availabilities[instance_type] = availability
-            # Derive the updated availabilities
-            else:
-                # Update the last_time_observed on this availability in the current availabilities
-                availability = self.current_availabilities[instance_type]
+        fetched_keys = fetched_availabilities.keys()
+        current_keys = self.current_availabilities.keys()
+
+        # Steady state: the same instances are available as on the last poll
+        if fetched_keys == current_keys:
+            # Only the last time observed changes; the current availabilities and regions stay valid
+            self.new_availabilities = _EMPTY
+            # Built in fetch order, like the general path below
+            self.updated_availabilities = ({instance_type: self.current_availabilities[instance_type]
+                                            for instance_type in fetched_keys}
+                                           if self.current_availabilities else _EMPTY)
+            self.removed_availabilities = _EMPTY
+            for availability in self.updated_availabilities.values():
                 availability.update(fetch_time)
-                # Add to the updated availabilities
-                self.updated_availabilities[instance_type] = availability
-
-        # Update the removed availabilities
-        for instance_type, availability in self.current_availabilities.items():
-            if instance_type not in fetched_availabilities:
-                self.removed_availabilities[instance_type] = availability
+            return
+
+        # Iterate the dicts rather than key set differences, so the results keep the fetch order
+        # (and the current order for removals) instead of a per-process hash order
+        # Derive the new availabilities
+        self.new_availabilities = {instance_type: availability
+                                   for instance_type, availability in fetched_availabilities.items()
+                                   if instance_type not in current_keys}
+
+        # Derive the updated availabilities, keeping the current availability objects
+        self.updated_availabilities = {instance_type: self.current_availabilities[instance_type]
+                                       for instance_type in fetched_keys
+                                       if instance_type in current_keys}
+        # Update the last_time_observed on these availabilities
+        for availability in self.updated_availabilities.values():
+            availability.update(fetch_time)
+
+        # Derive the removed availabilities
+        self.removed_availabilities = {instance_type: availability
+                                       for instance_type, availability in self.current_availabilities.items()
+                                       if instance_type not in fetched_keys}
 
         # Update the session start and end times
-        # Is start of a session? (no current availabilities and new availabilities)
-        if not self.current_availabilities and fetched_availabilities:
-            self.session_start_time = fetch_time
-        # Is end of a session? (no new availabilities and current availabilities)
-        elif self.current_availabilities and not fetched_availabilities:
-            self.session_end_time = fetch_time
-        # Else, no session in progress; leave session start and end times as they are
-        else:
-            pass
+        session_field = _SESSION_TRANSITIONS.get((bool(self.current_availabilities), bool(fetched_availabilities)))
+        if session_field is not None:
+            setattr(self, session_field, fetch_time)
 
         # Copy the new and updated availabilities to an empty current availabilities
         self.current_availabilities = {}
         self.current_availabilities.update(self.new_availabilities.copy())
         self.current_availabilities.update(self.updated_availabilities.copy())
+        self.current_regions = {instance_type.region for instance_type in fetched_keys}
@@ -1,5 +1,6 @@
 import random
 from datetime import timedelta, datetime
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 from src.data_structures import InstanceType, InstanceAvailability
@@ -66,3 +67,19 @@ def availabilities_generator(num: int,
         availabilities[availability.instance_type] = availability
 
     return availabilities
+
+
+@lru_cache(maxsize=16)
+def _cached_availabilities(num: int) -> Dict[InstanceType, InstanceAvailability]:
+    return availabilities_generator(num)
+
+
+def cached_availabilities_generator(num: int) -> Dict[InstanceType, InstanceAvailability]:
+    """
+    Same as availabilities_generator, but the availabilities for each count are only generated and validated once.
+
+    Each call returns a new dict of unvalidated copies, since Tracker.update() modifies the availabilities.
+    """
+    return {instance_type: availability.model_copy()
+            for instance_type, availability in _cached_availabilities(num).items()}
+
@@ -1,27 +1,55 @@
 import sys
-from io import StringIO
+from contextlib import contextmanager
+from typing import Iterator, List
 
 
-def helper_assert_and_print(expected_output: str, i: int, mock_stdout: StringIO) -> None:
+class CapturedOutput:
     """
-    Helper function to assert and print output in tests.
+    Minimal stdout replacement that records each write instead of appending to one buffer.
+
+    Attributes:
+        writes (List[str]): The strings written, in order.
+        flushes (int): The number of flush calls.
+        is_tty (bool): What isatty reports, to exercise the terminal output path.
+    """
+    __slots__ = ("writes", "flushes", "is_tty")
+
+    def __init__(self, is_tty: bool = False):
+        self.writes: List[str] = []
+        self.flushes = 0
+        self.is_tty = is_tty
+
+    def write(self, text: str) -> int:
+        # Return the number of characters written, like io.TextIOBase.write
+        self.writes.append(text)
+        return len(text)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+    def isatty(self) -> bool:
+        return self.is_tty
+
+    def getvalue(self) -> str:
+        return "".join(self.writes)
+
+
+@contextmanager
+def capture_stdout(is_tty: bool = False) -> Iterator[CapturedOutput]:
+    """
+    Context manager that captures stdout in a CapturedOutput.
+
+    Rebinds sys.stdout directly, which is much cheaper than unittest.mock.patch.
 
     Args:
-        expected_output (str): The expected output string.
-        i (int): The iteration count.
-        mock_stdout (StringIO): The mocked stdout buffer.
+        is_tty (bool): Whether the capture reports itself as a terminal.
 
+    Yields:
+        CapturedOutput: The recorder receiving everything written to stdout.
     """
-    # Check the buffer content after each switch
-    buffer_lines = mock_stdout.getvalue().split('\r')
-    if len(buffer_lines) > 1:
-        # Get the last line; the first one is empty due to the split on \r
-        actual_output = buffer_lines[-1]
-        if expected_output.startswith('\r'):
-            expected_output = expected_output[1:]
-        assert actual_output == expected_output, f"\nExpected: {expected_output}\nActual:   {actual_output}"
-
-    # Print the buffer content after each update for inspection
-    # Using sys.__stdout__ to avoid the patch
-    sys.__stdout__.write(f"After update {i + 1}:\n{mock_stdout.getvalue()}\n")
-    sys.__stdout__.flush()
+    original_stdout = sys.stdout
+    sys.stdout = CapturedOutput(is_tty)
+    try:
+        yield sys.stdout
+    finally:
+        sys.stdout = original_stdout
@@ -4,9 +4,9 @@
 # import unittest
 # from datetime import datetime
 #
-# from src.data_structures import InstanceAvailability
+# from src.data_structures import InstanceAvailability, InstanceType
 # from src.monitor import Monitor
-# from test.generators import availability_generator, instance_type_generator
+# from test.generators import availability_generator
 #
 #
 # class TestAnalyzeAvailability(unittest.TestCase):
@@ -43,12 +43,9 @@
 #
 # class TestAnalyzeAvailabilityWithDistinctSets(unittest.TestCase):
 #     def test_analyze_availability_with_distinct_sets(self):
-#         # Generate unique InstanceTypes
-#         unique_instance_types = set()
-#         while len(unique_instance_types) < 1000:
-#             inst_type = instance_type_generator()
-#             if inst_type not in unique_instance_types:
-#                 unique_instance_types.add(inst_type)
+#         # Generate unique InstanceTypes; distinct by construction, so no retry on collisions
+#         unique_instance_types = {InstanceType(name=f"Type_{i}", description=f"Description_{i}", region=f"Region_{i}")
+#                                  for i in range(1000)}
 #
 #         # Generate InstanceAvailability for each unique InstanceType
 #         all_instances = [InstanceAvailability(instance_type=inst_type, start_time=datetime.now())
@@ -7,6 +7,8 @@ from src.config import Config
 from src.monitor import Monitor
 from test.generators import availabilities_generator
 
+_KNOWN_REGIONS = sorted(lambda_api.KNOWN_REGIONS)
+
 
 class MonitorDetectNewRegions(unittest.TestCase):
     @patch('src.monitor.logging')
@@ -17,11 +19,11 @@ class MonitorDetectNewRegions(unittest.TestCase):
         fixed_now = datetime(2024, 1, 21, 14, 43, 26, 368333)
         mock_datetime.now.return_value = fixed_now
 
-        known_regions = lambda_api.static_dict_of_known_regions()
         new_logged_regions = set()
-        availabilities = availabilities_generator(5, region_list=list(known_regions))
+        availabilities = availabilities_generator(5, region_list=_KNOWN_REGIONS)
 
-        Monitor._detect_new_regions(availabilities, new_logged_regions, enable_voice_notifications=True)
+        current_regions = {instance_type.region for instance_type in availabilities}
+        Monitor._detect_new_regions(current_regions, new_logged_regions, enable_voice_notifications=True)
         mock_logging.assert_not_called()
         mock_system.assert_not_called()
         mock_print.assert_not_called()
@@ -34,14 +36,14 @@ class MonitorDetectNewRegions(unittest.TestCase):
         fixed_now = datetime(2024, 1, 21, 14, 43, 26, 368333)
         mock_datetime.now.return_value = fixed_now
 
-        known_regions = lambda_api.static_dict_of_known_regions()
         new_logged_regions = set()
         new_region = 'us-foo-1'
-        availabilities = availabilities_generator(5, region_list=list(known_regions))
+        availabilities = availabilities_generator(5, region_list=_KNOWN_REGIONS)
         with_new_region = availabilities_generator(1, region_list=[new_region]).popitem()[1]
         availabilities[with_new_region.instance_type] = with_new_region
 
-        Monitor._detect_new_regions(availabilities, new_logged_regions, enable_voice_notifications=True)
+        current_regions = {instance_type.region for instance_type in availabilities}
+        Monitor._detect_new_regions(current_regions, new_logged_regions, enable_voice_notifications=True)
         mock_logging.critical.assert_called_with(f"New region observed: {new_region}")
         mock_system.assert_called_with('say "New Region Detected"')
         mock_print.assert_called_with(f"{Config.now_formatted_str(fixed_now)} - New region observed: {new_region}")
@@ -55,11 +57,11 @@ class MonitorDetectNewRegions(unittest.TestCase):
         fixed_now = datetime(2024, 1, 21, 14, 43, 26, 368333)
         mock_datetime.now.return_value = fixed_now
 
-        known_regions = lambda_api.static_dict_of_known_regions()
         new_logged_regions = set()
-        availabilities = availabilities_generator(5, region_list=list(known_regions))
+        availabilities = availabilities_generator(5, region_list=_KNOWN_REGIONS)
 
-        Monitor._detect_new_regions(availabilities, new_logged_regions, enable_voice_notifications=False)
+        current_regions = {instance_type.region for instance_type in availabilities}
+        Monitor._detect_new_regions(current_regions, new_logged_regions, enable_voice_notifications=False)
         mock_logging.assert_not_called()
         mock_system.assert_not_called()
         mock_print.assert_not_called()
@@ -72,14 +74,14 @@ class MonitorDetectNewRegions(unittest.TestCase):
         fixed_now = datetime(2024, 1, 21, 14, 43, 26, 368333)
         mock_datetime.now.return_value = fixed_now
 
-        known_regions = lambda_api.static_dict_of_known_regions()
         new_logged_regions = set()
         new_region = 'us-foo-1'
-        availabilities = availabilities_generator(5, region_list=list(known_regions))
+        availabilities = availabilities_generator(5, region_list=_KNOWN_REGIONS)
         with_new_region = availabilities_generator(1, region_list=[new_region]).popitem()[1]
         availabilities[with_new_region.instance_type] = with_new_region
 
-        Monitor._detect_new_regions(availabilities, new_logged_regions, enable_voice_notifications=False)
+        current_regions = {instance_type.region for instance_type in availabilities}
+        Monitor._detect_new_regions(current_regions, new_logged_regions, enable_voice_notifications=False)
         mock_logging.critical.assert_called_with(f"New region observed: {new_region}")
         mock_system.assert_not_called()
         mock_print.assert_called_with(f"{Config.now_formatted_str(fixed_now)} - New region observed: {new_region}")
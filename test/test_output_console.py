@@ -1,115 +1,92 @@
 import datetime
 import random
 import unittest
+from contextlib import redirect_stdout
 from io import StringIO
-from unittest.mock import patch
 
-from helpers import helper_assert_and_print
+from test.generators import availabilities_generator
+from test.helpers import capture_stdout
 from src.data_structures import InstanceAvailability, InstanceType
-from src.output_console import render_to_console
+from src.output_console import render_console_output, render_to_console
+from src.tracker import Tracker
+
+# Shared test times; datetimes are immutable, so sharing them is safe
+_START = datetime.datetime(2024, 1, 1, 0, 0, 0)
+_LAST = datetime.datetime(2024, 1, 1, 1, 0, 0)
+
+# Render times shared by the render sequence scenarios
+_FIVE_MINUTE_TIMES = tuple(_START + datetime.timedelta(minutes=5 * i) for i in range(20))
+_TEN_MINUTE_TIMES = tuple(_START + datetime.timedelta(minutes=10 * i) for i in range(10))
+_MINUTE_TIMES = tuple(datetime.datetime(2024, 1, 1, 1, minute, 0) for minute in range(12))
+
+# Second instance for the multiple instances test
+_INST2_TYPE = InstanceType.get_or_create(
+    name="test-instance-2",
+    description="Another test instance",
+    region="us-east-1"
+)
+_INST2 = InstanceAvailability(
+    instance_type=_INST2_TYPE,
+    start_time=_START,
+    last_time_available=_START
+)
 
 
 class TestRenderToConsole(unittest.TestCase):
-    def setUp(self):
-        self.mock_start_time = datetime.datetime(2024, 1, 1, 0, 0, 0)
-        self.mock_session_start_time = datetime.datetime(2024, 1, 1, 1, 0, 0)
-        self.mock_session_end_time = datetime.datetime(2024, 1, 1, 2, 0, 0)
-        self.mock_instance_type = InstanceType(
+    @classmethod
+    def setUpClass(cls):
+        cls.mock_start_time = _START
+        cls.mock_session_start_time = _LAST
+        cls.mock_session_end_time = datetime.datetime(2024, 1, 1, 2, 0, 0)
+        cls.mock_instance_type = InstanceType.get_or_create(
             name="test-instance",
             description="A test instance",
             region="us-west-1"
         )
-        self.mock_instance = InstanceAvailability(
-            instance_type=self.mock_instance_type,
-            start_time=self.mock_start_time,
-            last_time_available=self.mock_start_time
-        )
-
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_available_instances(self, mock_stdout):
-        render_to_console(
-            True,
-            {self.mock_instance.instance_type.name},
-            self.mock_session_start_time,
-            None,
-            self.mock_start_time,
-        )
-        self.assertIn("Available Instances", mock_stdout.getvalue())
-
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_no_instances_no_last_available(self, mock_stdout):
-        render_to_console(
-            False,
-            set(),
-            None,
-            None,
-            self.mock_start_time,
-        )
-        self.assertIn("No instances available", mock_stdout.getvalue())
-        self.assertIn("since start", mock_stdout.getvalue())
-
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_no_instances_with_last_available(self, mock_stdout):
-        render_to_console(
-            False,
-            set(),
-            None,
-            self.mock_session_end_time,
-            self.mock_start_time,
-        )
-        self.assertIn("No instances available", mock_stdout.getvalue())
-        self.assertIn("since last available", mock_stdout.getvalue())
-
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_long_duration_since_last_available(self, mock_stdout):
-        long_last_available_time = datetime.datetime(2023, 1, 1, 1, 0, 0)
-        render_to_console(
-            False,
-            set(),
-            None,
-            long_last_available_time,
-            self.mock_start_time,
-        )
-        self.assertIn("No instances available", mock_stdout.getvalue())
-        self.assertIn("since last available", mock_stdout.getvalue())
-
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_multiple_available_instances(self, mock_stdout):
-        mock_instance2_type = InstanceType(
-            name="test-instance-2",
-            description="Another test instance",
-            region="us-east-1"
-        )
-        mock_instance2 = InstanceAvailability(
-            instance_type=mock_instance2_type,
-            start_time=self.mock_start_time,
-            last_time_available=self.mock_start_time
-        )
-        render_to_console(
-            True,
-            {self.mock_instance.instance_type.name, mock_instance2.instance_type.name},
-            self.mock_session_start_time,
-            None,
-            self.mock_start_time,
+        cls.mock_instance = InstanceAvailability(
+            instance_type=cls.mock_instance_type,
+            start_time=cls.mock_start_time,
+            last_time_available=cls.mock_start_time
         )
-        self.assertIn("Available Instances", mock_stdout.getvalue())
-        self.assertIn("test-instance", mock_stdout.getvalue())
-        self.assertIn("test-instance-2", mock_stdout.getvalue())
+        cls.single_name_set = {cls.mock_instance.instance_type.name}
+        cls.instances = {
+            "instance1": InstanceAvailability(
+                instance_type=InstanceType.get_or_create(
+                    name="instance1", description="Instance type 1", region="us-west-1"
+                ),
+                start_time=cls.mock_start_time,
+                last_time_available=cls.mock_start_time
+            ),
+            "instance2": InstanceAvailability(
+                instance_type=InstanceType.get_or_create(
+                    name="instance2", description="Instance type 2", region="us-east-1"
+                ),
+                start_time=cls.mock_start_time,
+                last_time_available=cls.mock_start_time
+            ),
+            "instance3": InstanceAvailability(
+                instance_type=InstanceType.get_or_create(
+                    name="instance3", description="Instance type 3", region="eu-central-1"
+                ),
+                start_time=cls.mock_start_time,
+                last_time_available=cls.mock_start_time
+            )
+        }
+        cls.start_time_str = f"{cls.mock_start_time:%Y-%m-%d %H:%M:%S.%f}"
 
-    @patch('src.output_console.datetime')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_no_availability_five_messages(self, mock_stdout, mock_datetime):
-        mock_times = [self.mock_start_time + datetime.timedelta(minutes=5 * i) for i in range(5)]
-        mock_datetime.now.side_effect = mock_times
+    def test_available_instances(self):
+        with redirect_stdout(StringIO()) as output:
+            render_to_console(
+                True,
+                {self.mock_instance.instance_type.name},
+                self.mock_session_start_time,
+                None,
+                self.mock_start_time,
+            )
+            self.assertIn("Available Instances", output.getvalue())
 
-        start_time_str = f"{self.mock_start_time:%Y-%m-%d %H:%M:%S.%f}"
-        for i in range(5):
-            current_time = mock_times[i]
-            duration_since_start = current_time - self.mock_start_time
-            expected_output = (f"\r{current_time:%Y-%m-%d %H:%M:%S.%f} - "
-                               f"No instances available. "
-                               f"Started at: {start_time_str}, "
-                               f"Duration since start: {duration_since_start}")
+    def test_no_instances_no_last_available(self):
+        with redirect_stdout(StringIO()) as output:
             render_to_console(
                 False,
                 set(),
@@ -117,223 +94,187 @@ class TestRenderToConsole(unittest.TestCase):
                 None,
                 self.mock_start_time,
             )
+            self.assertIn("No instances available", output.getvalue())
+            self.assertIn("since start", output.getvalue())
 
-            # Check the buffer content after each message
-            helper_assert_and_print(expected_output, i, mock_stdout)
-
-    @patch('src.output_console.datetime')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_one_availability_five_messages(self, mock_stdout, mock_datetime):
-        mock_times = [self.mock_start_time + datetime.timedelta(minutes=5 * i) for i in range(5)]
-        mock_datetime.now.side_effect = mock_times
-
-        for i in range(5):
-            current_time = mock_times[i]
-            duration_since_start = current_time - self.mock_start_time
-            expected_output = (f"\r{current_time:%Y-%m-%d %H:%M:%S.%f} - "
-                               f"Available Instances: {{'test-instance'}}, "
-                               f"Availability Duration: {duration_since_start}")
+    def test_no_instances_with_last_available(self):
+        with redirect_stdout(StringIO()) as output:
             render_to_console(
-                True,
-                {self.mock_instance.instance_type.name},
-                self.mock_start_time,
+                False,
+                set(),
                 None,
+                self.mock_session_end_time,
                 self.mock_start_time,
             )
+            self.assertIn("No instances available", output.getvalue())
+            self.assertIn("since last available", output.getvalue())
 
-            # Check the buffer content after each message
-            helper_assert_and_print(expected_output, i, mock_stdout)
-
-
-class TestRenderToConsoleSwitching(unittest.TestCase):
-    def setUp(self):
-        self.mock_start_time = datetime.datetime(2024, 1, 1, 0, 0, 0)
-        self.mock_instance_type = InstanceType(
-            name="test-instance",
-            description="A test instance",
-            region="us-west-1"
-        )
-        self.mock_instance = InstanceAvailability(
-            instance_type=self.mock_instance_type,
-            start_time=self.mock_start_time,
-            last_time_available=self.mock_start_time
-        )
-
-    @patch('src.output_console.datetime')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_switching_availability_three_times(self, mock_stdout, mock_datetime):
-        mock_times = [datetime.datetime(2024, 1, 1, 1, minute, 0) for minute in range(12)]
-        mock_datetime.now.side_effect = mock_times
-
-        last_available_time = None
-        for i in range(6):
-            is_available = i % 2 == 0
-            current_time = mock_times[i]
-            if is_available:
-                instances = [self.mock_instance]
-                last_available_time = current_time
-                expected_output = (f"\r{current_time:%Y-%m-%d %H:%M:%S.%f} - "
-                                   f"Available Instances: {{'test-instance'}}, "
-                                   f"Availability Duration: {current_time - last_available_time}")
-                render_to_console(
-                    True,
-                    set([i.instance_type.name for i in instances]),
-                    last_available_time,
-                    None,
-                    self.mock_start_time,
-                )
-            else:
-                duration_since_reference = current_time - (last_available_time if last_available_time is not None
-                                                           else self.mock_start_time)
-                duration_message = "since last available" if last_available_time is not None else "since start"
-                expected_output = (f"\r{current_time:%Y-%m-%d %H:%M:%S.%f} - "
-                                   f"No instances available. "
-                                   f"Last available at: {last_available_time:%Y-%m-%d %H:%M:%S.%f}, "
-                                   f"Duration {duration_message}: {duration_since_reference}")
-                render_to_console(
-                    False,
-                    set(),
-                    None,
-                    last_available_time,
-                    self.mock_start_time,
-                )
-
-            helper_assert_and_print(expected_output, i, mock_stdout)
-
-
-class TestRenderToConsoleSwitchingStartNotAvailable(unittest.TestCase):
-    def setUp(self):
-        self.mock_start_time = datetime.datetime(2024, 1, 1, 0, 0, 0)
-        self.mock_instance_type = InstanceType(
-            name="test-instance",
-            description="A test instance",
-            region="us-west-1"
-        )
-        self.mock_instance = InstanceAvailability(
-            instance_type=self.mock_instance_type,
-            start_time=self.mock_start_time,
-            last_time_available=self.mock_start_time
-        )
-
-    @patch('src.output_console.datetime')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_switching_start_not_available(self, mock_stdout, mock_datetime):
-        mock_times = [datetime.datetime(2024, 1, 1, 1, minute, 0) for minute in range(12)]
-        mock_datetime.now.side_effect = mock_times
-
-        start_time_str = f"{self.mock_start_time:%Y-%m-%d %H:%M:%S.%f}"
-        last_available_time = None
-        for i in range(6):
-            is_available = i % 2 != 0  # Start with not available
-            current_time = mock_times[i]
-            if is_available:
-                instances = [self.mock_instance]
-                last_available_time = current_time
-                expected_output = (f"\r{current_time:%Y-%m-%d %H:%M:%S.%f} - "
-                                   f"Available Instances: {{'test-instance'}}, "
-                                   f"Availability Duration: {current_time - last_available_time}")
-                render_to_console(
-                    True,
-                    set([i.instance_type.name for i in instances]),
-                    last_available_time,
-                    None,
-                    self.mock_start_time,
-                )
-            else:
-                last_message = "Started at" if last_available_time is None else "Last available at"
-                duration_since_reference = current_time - (
-                    self.mock_start_time if last_available_time is None else last_available_time)
-                duration_message = "since start" if last_available_time is None else "since last available"
-                last_available_time_str = f"{last_available_time:%Y-%m-%d %H:%M:%S.%f}" \
-                    if last_available_time is not None else start_time_str
-                expected_output = (f"\r{current_time:%Y-%m-%d %H:%M:%S.%f} - No instances available. "
-                                   f"{last_message}: {last_available_time_str}, "
-                                   f"Duration {duration_message}: {duration_since_reference}")
-                render_to_console(
-                    False,
-                    set(),
-                    None,
-                    last_available_time,
-                    self.mock_start_time,
-                )
-
-            helper_assert_and_print(expected_output, i, mock_stdout)
-
-
-class TestRenderToConsoleNotAvailableUpdates(unittest.TestCase):
-    def setUp(self):
-        self.mock_start_time = datetime.datetime(2024, 1, 1, 0, 0, 0)
-
-    @patch('src.output_console.datetime')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_not_available_updates(self, mock_stdout, mock_datetime):
-        mock_times = [self.mock_start_time + datetime.timedelta(minutes=10 * i) for i in range(10)]
-        mock_datetime.now.side_effect = mock_times
-
-        start_time_str = f"{self.mock_start_time:%Y-%m-%d %H:%M:%S.%f}"
-        for i in range(10):
-            current_time = mock_times[i]
-            duration_since_start = current_time - self.mock_start_time
-            expected_output = (f"\r{current_time:%Y-%m-%d %H:%M:%S.%f} - "
-                               f"No instances available. "
-                               f"Started at: {start_time_str}, "
-                               f"Duration since start: {duration_since_start}")
+    def test_long_duration_since_last_available(self):
+        with redirect_stdout(StringIO()) as output:
+            long_last_available_time = datetime.datetime(2023, 1, 1, 1, 0, 0)
             render_to_console(
                 False,
                 set(),
                 None,
-                None,
+                long_last_available_time,
                 self.mock_start_time,
             )
+            self.assertIn("No instances available", output.getvalue())
+            self.assertIn("since last available", output.getvalue())
 
-            helper_assert_and_print(expected_output, i, mock_stdout)
-
-
-class TestRenderToConsoleAvailableRandomUpdates(unittest.TestCase):
-    def setUp(self):
-        self.mock_start_time = datetime.datetime(2024, 1, 1, 0, 0, 0)
-        self.instances = {
-            "instance1": InstanceAvailability(
-                instance_type=InstanceType(name="instance1", description="Instance type 1", region="us-west-1"),
-                start_time=self.mock_start_time,
-                last_time_available=self.mock_start_time
-            ),
-            "instance2": InstanceAvailability(
-                instance_type=InstanceType(name="instance2", description="Instance type 2", region="us-east-1"),
-                start_time=self.mock_start_time,
-                last_time_available=self.mock_start_time
-            ),
-            "instance3": InstanceAvailability(
-                instance_type=InstanceType(name="instance3", description="Instance type 3", region="eu-central-1"),
-                start_time=self.mock_start_time,
-                last_time_available=self.mock_start_time
-            )
-        }
-
-    @patch('src.output_console.datetime')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_available_random_updates(self, mock_stdout, mock_datetime):
-        mock_times = [self.mock_start_time + datetime.timedelta(minutes=5 * i) for i in range(20)]
-        mock_datetime.now.side_effect = mock_times
-
-        last_available_time = self.mock_start_time
-        for i in range(20):
-            current_time = mock_times[i]
-            # Randomly choose one or more instances
-            available_instances = random.sample(list(self.instances.values()), random.randint(1, 3))
-            duration_since_last_available = current_time - last_available_time
-            instance_names = set([instance.instance_type.name for instance in available_instances])
-            expected_output = (f"\r{current_time:%Y-%m-%d %H:%M:%S.%f} - "
-                               f"Available Instances: {instance_names}, "
-                               f"Availability Duration: {duration_since_last_available}")
+    def test_multiple_available_instances(self):
+        with redirect_stdout(StringIO()) as output:
             render_to_console(
                 True,
-                instance_names,
-                last_available_time,
+                {self.mock_instance.instance_type.name, _INST2.instance_type.name},
+                self.mock_session_start_time,
                 None,
                 self.mock_start_time,
             )
+            self.assertIn("Available Instances", output.getvalue())
+            self.assertIn("test-instance", output.getvalue())
+            self.assertIn("test-instance-2", output.getvalue())
+
+    def test_render_sequences(self):
+        # Each scenario is a sequence of renders, checked against the whole transcript once rendered
+        scenarios = (
+            ("no_availability_five_messages", self._not_available_steps(_FIVE_MINUTE_TIMES[:5])),
+            ("one_availability_five_messages", self._one_available_steps(_FIVE_MINUTE_TIMES[:5])),
+            ("switching_availability_three_times", self._switching_steps(_MINUTE_TIMES[:6], start_available=True)),
+            ("switching_start_not_available", self._switching_steps(_MINUTE_TIMES[:6], start_available=False)),
+            ("not_available_updates", self._not_available_steps(_TEN_MINUTE_TIMES)),
+            ("available_random_updates", self._random_available_steps(_FIVE_MINUTE_TIMES)),
+        )
+        for name, steps in scenarios:
+            with self.subTest(scenario=name), capture_stdout() as mock_stdout:
+                for is_available, instance_names, session_start_time, session_end_time, now, _ in steps:
+                    render_to_console(
+                        is_available,
+                        instance_names,
+                        session_start_time,
+                        session_end_time,
+                        self.mock_start_time,
+                        now=now,
+                    )
+                # Each render is a single write, so the writes line up with the steps
+                self.assertEqual(mock_stdout.writes, [step[-1] for step in steps])
+
+    def _not_available_steps(self, mock_times):
+        # No instances were ever available, so every message is relative to the start time
+        steps = []
+        for current_time in mock_times:
+            expected_output = (f"\r{current_time:%Y-%m-%d %H:%M:%S.%f} - "
+                               f"No instances available. "
+                               f"Started at: {self.start_time_str}, "
+                               f"Duration since start: {current_time - self.mock_start_time}")
+            steps.append((False, set(), None, None, current_time, expected_output))
+        return steps
+
+    def _one_available_steps(self, mock_times):
+        # A single instance available for the whole run, in a session starting at the start time
+        steps = []
+        for current_time in mock_times:
+            expected_output = (f"\r{current_time:%Y-%m-%d %H:%M:%S.%f} - "
+                               f"Available Instances: ['test-instance'], "
+                               f"Availability Duration: {current_time - self.mock_start_time}")
+            steps.append((True, self.single_name_set, self.mock_start_time, None, current_time, expected_output))
+        return steps
+
+    def _switching_steps(self, mock_times, start_available):
+        # The instance alternates between available and unavailable on every render
+        steps = []
+        last_available_time = None
+        for i, current_time in enumerate(mock_times):
+            time_str = f"{current_time:%Y-%m-%d %H:%M:%S.%f}"
+            if (i % 2 == 0) == start_available:
+                last_available_time = current_time
+                last_available_time_str = time_str
+                expected_output = (f"\r{time_str} - "
+                                   f"Available Instances: ['test-instance'], "
+                                   f"Availability Duration: {current_time - last_available_time}")
+                steps.append((True, self.single_name_set, last_available_time, None, current_time, expected_output))
+            elif last_available_time is None:
+                expected_output = (f"\r{time_str} - No instances available. "
+                                   f"Started at: {self.start_time_str}, "
+                                   f"Duration since start: {current_time - self.mock_start_time}")
+                steps.append((False, set(), None, None, current_time, expected_output))
+            else:
+                expected_output = (f"\r{time_str} - No instances available. "
+                                   f"Last available at: {last_available_time_str}, "
+                                   f"Duration since last available: {current_time - last_available_time}")
+                steps.append((False, set(), None, last_available_time, current_time, expected_output))
+        return steps
+
+    def _random_available_steps(self, mock_times):
+        # Randomly choose one or more instances per update; seeded so failures are reproducible
+        rng = random.Random(42)
+        instances = list(self.instances.values())
+        steps = []
+        for current_time in mock_times:
+            available_instances = rng.sample(instances, rng.randint(1, 3))
+            instance_names = {instance.instance_type.name for instance in available_instances}
+            expected_output = (f"\r{current_time:%Y-%m-%d %H:%M:%S.%f} - "
+                               f"Available Instances: {sorted(instance_names)}, "
+                               f"Availability Duration: {current_time - self.mock_start_time}")
+            steps.append((True, instance_names, self.mock_start_time, None, current_time, expected_output))
+        return steps
 
-            # Check the buffer content after each switch
-            helper_assert_and_print(expected_output, i, mock_stdout)
 
+class TestRenderConsoleOutputNotTTY(unittest.TestCase):
+    def setUp(self):
+        self.mock_start_time = _START
+        self.tracker = Tracker(start_time=self.mock_start_time)
+
+    def test_skips_unchanged_poll(self):
+        with capture_stdout() as mock_stdout:
+            fetch_time = self.mock_start_time + datetime.timedelta(minutes=5)
+            self.tracker.update({}, fetch_time)
+            render_console_output(self.tracker)
+            self.assertEqual(mock_stdout.getvalue(), "")
+
+    def test_renders_changed_poll(self):
+        with capture_stdout() as mock_stdout:
+            fetch_time = self.mock_start_time + datetime.timedelta(minutes=5)
+            self.tracker.update(availabilities_generator(1), fetch_time)
+            render_console_output(self.tracker)
+            self.assertIn("Available Instances", mock_stdout.getvalue())
+            # A change starts on a new line, then renders the progress line
+            self.assertTrue(mock_stdout.getvalue().startswith(f"\n\r{fetch_time:%Y-%m-%d %H:%M:%S.%f} - "))
+            # Off a terminal the write is left for flush_console
+            self.assertEqual(mock_stdout.flushes, 0)
+
+
+    def test_renders_each_change_on_its_own_line(self):
+        availabilities = availabilities_generator(1)
+        with capture_stdout() as mock_stdout:
+            # Polls: nothing, available, unchanged, unavailable, available again
+            for minutes, fetched in enumerate(({}, availabilities, availabilities, {}, availabilities), start=1):
+                fetch_time = self.mock_start_time + datetime.timedelta(minutes=minutes)
+                self.tracker.update(dict(fetched), fetch_time)
+                render_console_output(self.tracker)
+
+            # Only the three changes are rendered, each after a newline rather than over the previous line
+            lines = mock_stdout.getvalue().split("\n")
+            self.assertEqual(lines[0], "")
+            self.assertEqual(len(lines[1:]), 3)
+            for line in lines[1:]:
+                self.assertTrue(line.startswith("\r"))
+                self.assertEqual(line.count("\r"), 1)
+
+
+class TestRenderConsoleOutputTTY(unittest.TestCase):
+    def setUp(self):
+        self.mock_start_time = _START
+        self.tracker = Tracker(start_time=self.mock_start_time)
+
+    def test_renders_and_flushes_unchanged_poll(self):
+        with capture_stdout(is_tty=True) as mock_stdout:
+            fetch_time = self.mock_start_time + datetime.timedelta(minutes=5)
+            self.tracker.update({}, fetch_time)
+            render_console_output(self.tracker)
+            self.assertEqual(mock_stdout.writes, [
+                f"\r{fetch_time:%Y-%m-%d %H:%M:%S.%f} - No instances available. "
+                f"Started at: {self.mock_start_time:%Y-%m-%d %H:%M:%S.%f}, "
+                f"Duration since start: {fetch_time - self.mock_start_time}"
+            ])
+            self.assertEqual(mock_stdout.flushes, 1)
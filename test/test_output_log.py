@@ -1,36 +1,75 @@
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest import TestCase
-from unittest.mock import patch
 
 from src.data_structures import InstanceAvailability, InstanceType
-from src.output_log import log_instance_info
+from src.output_log import log_instance_changes, log_instance_info
+from src.tracker import Tracker
 
 
 class LogInstanceInfoTests(TestCase):
-    @patch.object(logging, 'info')
-    def test_instance_unavailable_logs_correct_info(self, mock_logging_info):
-        instance_type = InstanceType(name="t2.micro", region="us-west-2", description="Test instance")
-        instance_availability = InstanceAvailability(instance_type=instance_type,
-                                                     start_time=datetime(2022, 1, 1, 12, 0, 0),
-                                                     last_time_available=datetime(2022, 1, 1, 13, 0, 0))
-        log_instance_info(instance_availability, "Unavailable")
-        mock_logging_info.assert_called_once()
-
-    @patch.object(logging, 'info')
-    def test_instance_available_logs_correct_info(self, mock_logging_info):
-        instance_type = InstanceType(name="t2.micro", region="us-west-2", description="Test instance")
-        instance_availability = InstanceAvailability(instance_type=instance_type,
-                                                     start_time=datetime(2022, 1, 1, 12, 0, 0),
-                                                     last_time_available=datetime(2022, 1, 1, 13, 0, 0))
-        log_instance_info(instance_availability, "Available")
-        mock_logging_info.assert_called_once()
-
-    @patch.object(logging, 'error')
-    def test_invalid_status_logs_error(self, mock_logging_error):
-        instance_type = InstanceType(name="t2.micro", region="us-west-2", description="Test instance")
-        instance_availability = InstanceAvailability(instance_type=instance_type,
-                                                     start_time=datetime(2022, 1, 1, 12, 0, 0),
-                                                     last_time_available=datetime(2022, 1, 1, 13, 0, 0))
-        log_instance_info(instance_availability, "Invalid")
-        mock_logging_error.assert_called_once()
+    @classmethod
+    def setUpClass(cls):
+        # Logging does not modify the availability, so all tests share one
+        cls.instance_type = InstanceType.get_or_create(name="t2.micro", region="us-west-2", description="Test instance")
+        cls.instance_availability = InstanceAvailability(instance_type=cls.instance_type,
+                                                         start_time=datetime(2022, 1, 1, 12, 0, 0),
+                                                         last_time_available=datetime(2022, 1, 1, 13, 0, 0))
+
+    def test_log_instance_info(self):
+        # Each status is logged exactly once, at its level; assertLogs captures at the handler, without patching
+        for status, level in (("Unavailable", logging.INFO), ("Available", logging.INFO), ("Invalid", logging.ERROR)):
+            with self.subTest(status=status):
+                with self.assertLogs(level=logging.INFO) as captured:
+                    log_instance_info(self.instance_availability, status)
+                self.assertEqual([record.levelno for record in captured.records], [level])
+
+
+class LogInstanceChangesTests(TestCase):
+    def setUp(self):
+        # Built per test, since Tracker.update() stamps fetch times on the availabilities
+        self.start_time = datetime(2022, 1, 1, 12, 0, 0)
+        self.availabilities = {}
+        for name, region in (("t2.micro", "us-west-2"), ("t2.large", "us-east-1")):
+            instance_type = InstanceType.get_or_create(name=name, region=region, description="Test instance")
+            self.availabilities[instance_type] = InstanceAvailability(instance_type=instance_type,
+                                                                      start_time=self.start_time,
+                                                                      last_time_available=self.start_time)
+        self.tracker = Tracker(start_time=self.start_time)
+
+    def _assert_one_batch(self, captured, expected_lines):
+        # All changes of one status are a single record: a header, then one formatted line per instance,
+        # in the order the instances were fetched
+        self.assertEqual(len(captured.records), 1)
+        header, *lines = captured.records[0].getMessage().split("\n")
+        self.assertEqual(header, "Availability changes:")
+        self.assertEqual(lines, expected_lines)
+
+    def test_logs_available_batch(self):
+        self.tracker.update(self.availabilities, self.start_time)
+        with self.assertLogs(level=logging.INFO) as captured:
+            log_instance_changes(self.tracker)
+        self._assert_one_batch(captured, [
+            f"Instance Type: {instance_type.name}, Region: {instance_type.region} - Status: Available - "
+            f"Start: {self.start_time}"
+            for instance_type in self.availabilities
+        ])
+
+    def test_logs_unavailable_batch(self):
+        end_time = self.start_time + timedelta(hours=1)
+        self.tracker.update(self.availabilities, self.start_time)
+        self.tracker.update(self.availabilities, end_time)
+        self.tracker.update({}, end_time + timedelta(hours=1))
+        with self.assertLogs(level=logging.INFO) as captured:
+            log_instance_changes(self.tracker)
+        self._assert_one_batch(captured, [
+            f"Instance Type: {instance_type.name}, Region: {instance_type.region} - Status: Unavailable - "
+            f"Start: {self.start_time} - End: {end_time} - Duration: {end_time - self.start_time}"
+            for instance_type in self.availabilities
+        ])
+
+    def test_logs_nothing_without_changes(self):
+        self.tracker.update(self.availabilities, self.start_time)
+        self.tracker.update(self.availabilities, self.start_time + timedelta(hours=1))
+        with self.assertNoLogs(level=logging.INFO):
+            log_instance_changes(self.tracker)
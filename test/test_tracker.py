@@ -1,179 +1,235 @@
 import unittest
+from dataclasses import asdict
 from datetime import datetime
 from datetime import timedelta
+from itertools import islice
+from typing import Dict, Iterable, Set, Tuple
 
-from data_structures import InstanceType, InstanceAvailability
-from generators import availabilities_generator
-from tracker import Tracker
+from src.data_structures import InstanceType, InstanceAvailability
+from test.generators import cached_availabilities_generator
+from src.tracker import Tracker
+
+# Fixed test clock, so fetch times are distinct and ordered without reading the wall clock
+_T0 = datetime(2024, 1, 1, 0, 0, 0)
+
+
+def _t(offset_seconds: int) -> datetime:
+    return _T0 + timedelta(seconds=offset_seconds)
+
+
+def _names(availabilities: Dict[InstanceType, InstanceAvailability]) -> Set[str]:
+    return {instance_type.name for instance_type in availabilities}
+
+
+def _refetched(items: Iterable[Tuple[InstanceType, InstanceAvailability]],
+               fetch_time: datetime) -> Dict[InstanceType, InstanceAvailability]:
+    # Unvalidated copies of the availabilities as seen again at the fetch time, sharing the frozen instance types
+    return {instance_type: InstanceAvailability.model_construct(instance_type=instance_type,
+                                                                 start_time=availability.start_time,
+                                                                 last_time_available=fetch_time)
+            for instance_type, availability in items}
 
 
 class TestTracker(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tracker = Tracker(start_time=_T0)
+
     def setUp(self) -> None:
-        self.tracker = Tracker(start_time=datetime.now())
+        self.tracker.reset()
 
     def test_initialization(self):
         self.assertFalse(self.tracker.has_ever_observed_instances)
         self.assertIsNone(self.tracker.last_fetch_time)
-        self.assertEqual(len(self.tracker.current_availabilities), 0)
+        self.assertEqual(self.tracker.current_count, 0)
+
+    def test_reset(self):
+        self.tracker.update(cached_availabilities_generator(3), _t(0))
+        self.tracker.reset()
+        self.assertEqual(self.tracker.start_time, _T0)
+        self.assertFalse(self.tracker.has_ever_observed_instances)
+        self.assertTrue(self.tracker.is_first_poll())
+        self.assertFalse(self.tracker.is_session_active())
+        self.assertIsNone(self.tracker.session_start_time)
+        self.assertFalse(self.tracker.has_new_availabilities())
+        self.assertEqual(self.tracker.get_current_names(), set())
+        self.assertEqual(self.tracker.current_regions, set())
 
     def test_is_first_poll(self):
         self.assertTrue(self.tracker.is_first_poll())
-        self.tracker.last_fetch_time = datetime.now()
+        self.tracker.last_fetch_time = _t(0)
         self.assertFalse(self.tracker.is_first_poll())
 
     def test_is_session_active(self):
         self.assertFalse(self.tracker.is_session_active())
-        self.tracker.current_availabilities = availabilities_generator(5)
+        self.tracker.current_availabilities = cached_availabilities_generator(5)
         self.assertTrue(self.tracker.is_session_active())
 
     def test_get_current_names(self):
-        self.tracker.current_availabilities = availabilities_generator(5)
+        self.tracker.current_availabilities = cached_availabilities_generator(5)
         self.assertEqual(len(self.tracker.get_current_names()), 5)
 
+    def test_get_current_names_after_assignment(self):
+        # Names cached for one dict are not reused once another dict is assigned
+        self.assertEqual(self.tracker.get_current_names(), set())
+        current_availabilities = cached_availabilities_generator(3)
+        self.tracker.current_availabilities = current_availabilities
+        self.assertEqual(self.tracker.get_current_names(),
+                         {instance_type.name for instance_type in current_availabilities})
+
     def test_has_current_availabilities(self):
         self.assertFalse(self.tracker.has_current_availabilities())
-        self.tracker.current_availabilities = availabilities_generator(1)
+        self.tracker.current_availabilities = cached_availabilities_generator(1)
         self.assertTrue(self.tracker.has_current_availabilities())
 
     def test_update_method(self):
-        fetched_availabilities = availabilities_generator(3)
-        self.tracker.update(fetched_availabilities, datetime.now())
-        self.assertEqual(len(self.tracker.new_availabilities), 3)
+        fetched_availabilities = cached_availabilities_generator(3)
+        self.tracker.update(fetched_availabilities, _t(0))
+        self.assertEqual(self.tracker.new_count, 3)
         self.assertTrue(self.tracker.has_ever_observed_instances)
 
-    # Similar tests for get_new_names, get_updated_names, get_removed_names
-    # Similar tests for has_new_availabilities, has_updated_availabilities, has_removed_availabilities
-
-
-class TestTrackerWithUpdate(unittest.TestCase):
-
-    def setUp(self) -> None:
-        self.tracker = Tracker(start_time=datetime.now())
+    # Tests driving the tracker through update()
 
     def test_initialization_with_update(self):
-        fetched_availabilities = availabilities_generator(0)
-        self.tracker.update(fetched_availabilities, datetime.now())
+        fetched_availabilities = cached_availabilities_generator(0)
+        self.tracker.update(fetched_availabilities, _t(0))
         self.assertFalse(self.tracker.has_ever_observed_instances)
         self.assertIsNotNone(self.tracker.last_fetch_time)
 
     def test_is_first_poll_with_update(self):
-        fetched_availabilities = availabilities_generator(0)
-        self.tracker.update(fetched_availabilities, datetime.now())
+        fetched_availabilities = cached_availabilities_generator(0)
+        self.tracker.update(fetched_availabilities, _t(0))
         self.assertFalse(self.tracker.is_first_poll())
 
     def test_is_session_active_with_update(self):
-        fetched_availabilities = availabilities_generator(0)
-        self.tracker.update(fetched_availabilities, datetime.now())
+        fetched_availabilities = cached_availabilities_generator(0)
+        self.tracker.update(fetched_availabilities, _t(0))
         self.assertFalse(self.tracker.is_session_active())
-        fetched_availabilities = availabilities_generator(5)
-        self.tracker.update(fetched_availabilities, datetime.now())
+        fetched_availabilities = cached_availabilities_generator(5)
+        self.tracker.update(fetched_availabilities, _t(1))
         self.assertTrue(self.tracker.is_session_active())
 
     def test_get_current_names_with_update(self):
-        fetched_availabilities = availabilities_generator(5)
-        self.tracker.update(fetched_availabilities, datetime.now())
-        self.assertEqual(len(self.tracker.get_current_names()), 5)
+        fetched_availabilities = cached_availabilities_generator(5)
+        self.tracker.update(fetched_availabilities, _t(0))
+        self.assertEqual(self.tracker.get_current_names(),
+                         {instance_type.name for instance_type in fetched_availabilities})
+        self.assertEqual(self.tracker.current_count, 5)
 
     def test_has_current_availabilities_with_update(self):
-        fetched_availabilities = availabilities_generator(0)
-        self.tracker.update(fetched_availabilities, datetime.now())
+        fetched_availabilities = cached_availabilities_generator(0)
+        self.tracker.update(fetched_availabilities, _t(0))
         self.assertFalse(self.tracker.has_current_availabilities())
-        fetched_availabilities = availabilities_generator(1)
-        self.tracker.update(fetched_availabilities, datetime.now())
+        fetched_availabilities = cached_availabilities_generator(1)
+        self.tracker.update(fetched_availabilities, _t(1))
         self.assertTrue(self.tracker.has_current_availabilities())
 
-    def test_get_new_names_with_update(self):
-        # Initially, no new availabilities
-        fetched_availabilities = availabilities_generator(0)
-        self.tracker.update(fetched_availabilities, datetime.now())
-        self.assertEqual(len(self.tracker.get_new_names()), 0)
-
-        # Add new availabilities
-        new_availabilities = availabilities_generator(3)
-        self.tracker.update(new_availabilities, datetime.now())
-        self.assertEqual(len(self.tracker.get_new_names()), 3)
-
-    def test_get_updated_names_with_update(self):
-        # Setup initial state
-        initial_availabilities = availabilities_generator(3)
-        now_1 = datetime.now()
-        self.tracker.update(initial_availabilities, now_1)
-
-        # Modify some availabilities to simulate an update
-        updated_availabilities: dict = dict(list(initial_availabilities.items())[0:2])
-        now_2 = datetime.now()
-        for key in updated_availabilities.keys():
-            # Make a copy
-            copy = updated_availabilities[key].model_copy(deep=True)
-            copy.update(now_2)
-            updated_availabilities[key] = copy
-
-        # Update the tracker
-        self.tracker.update(updated_availabilities, now_2)
-
-        self.assertEqual(len(self.tracker.get_updated_names()), len(updated_availabilities))
-
-    def test_get_removed_names_with_update(self):
-        # Setup initial state
-        initial_availabilities = availabilities_generator(3)
-        self.tracker.update(initial_availabilities, datetime.now())
-
-        # Update with fewer availabilities to simulate removal
-        removed_availabilities = dict(list(initial_availabilities.items())[0:1])
-        self.tracker.update(removed_availabilities, datetime.now())
-        self.assertEqual(len(self.tracker.get_removed_names()), 2)  # 3 initial - 1 remaining = 2 removed
-
-    def test_has_new_availabilities_with_update(self):
-        # Initially, no new availabilities
-        fetched_availabilities = availabilities_generator(0)
-        self.tracker.update(fetched_availabilities, datetime.now())
+    def test_update_transitions(self):
+        # (name, initial count, initial availabilities fetched again, availabilities added by the second fetch)
+        cases = (
+            ("new", 0, 0, 3),
+            ("updated", 3, 2, 0),
+            ("removed", 3, 1, 0),
+        )
+        for name, initial_count, kept_count, added_count in cases:
+            with self.subTest(transition=name):
+                self.tracker.reset()
+                initial_availabilities = cached_availabilities_generator(initial_count)
+                if initial_availabilities:
+                    self.tracker.update(initial_availabilities, _t(0))
+                else:
+                    # An empty first fetch only records the fetch time, so set it directly
+                    self.tracker.last_fetch_time = _t(0)
+                self.assertEqual(self.tracker.get_new_names(), _names(initial_availabilities))
+                self.assertEqual(self.tracker.new_count, initial_count)
+
+                kept = _refetched(islice(initial_availabilities.items(), kept_count), _t(1))
+                added = cached_availabilities_generator(added_count)
+                removed = {instance_type: availability for instance_type, availability in initial_availabilities.items()
+                           if instance_type not in kept}
+                self.tracker.update({**kept, **added}, _t(1))
+
+                # The name sets are checked first; the counts and predicates must agree with them
+                self.assertEqual(self.tracker.get_new_names(), _names(added))
+                self.assertEqual(self.tracker.get_updated_names(), _names(kept))
+                self.assertEqual(self.tracker.get_removed_names(), _names(removed))
+                self.assertEqual(self.tracker.new_count, len(added))
+                self.assertEqual(self.tracker.updated_count, len(kept))
+                self.assertEqual(self.tracker.removed_count, len(removed))
+                self.assertEqual(self.tracker.has_new_availabilities(), bool(added))
+                self.assertEqual(self.tracker.has_updated_availabilities(), bool(kept))
+                self.assertEqual(self.tracker.has_removed_availabilities(), bool(removed))
+
+    def test_update_keeps_fetch_order(self):
+        initial_availabilities = cached_availabilities_generator(5)
+        self.tracker.update(initial_availabilities, _t(0))
+        self.assertEqual(list(self.tracker.new_availabilities), list(initial_availabilities))
+
+        # Drop the middle availability, then fetch the rest in reverse order
+        instance_types = list(initial_availabilities)
+        refetched = _refetched(((instance_type, initial_availabilities[instance_type])
+                                for instance_type in reversed(instance_types) if instance_type != instance_types[2]),
+                               _t(1))
+        self.tracker.update(refetched, _t(1))
+        self.assertEqual(list(self.tracker.updated_availabilities), list(refetched))
+        self.assertEqual(list(self.tracker.current_availabilities), list(refetched))
+        self.assertEqual(list(self.tracker.removed_availabilities), [instance_types[2]])
+
+        # Fetch the same instances again in another order; the unchanged poll also follows the fetch order
+        reordered = dict(sorted(refetched.items(), key=lambda item: instance_types.index(item[0])))
+        self.tracker.update(reordered, _t(2))
         self.assertFalse(self.tracker.has_new_availabilities())
+        self.assertFalse(self.tracker.has_removed_availabilities())
+        self.assertEqual(list(self.tracker.updated_availabilities), list(reordered))
 
-        # Add new availabilities
-        new_availabilities = availabilities_generator(2)
-        self.tracker.update(new_availabilities, datetime.now())
-        self.assertTrue(self.tracker.has_new_availabilities())
+    def test_update_with_unchanged_availabilities(self):
+        initial_availabilities = cached_availabilities_generator(3)
+        self.tracker.update(initial_availabilities, _t(0))
 
-    def test_has_updated_availabilities_with_update(self):
-        # Setup initial state
-        initial_availabilities = availabilities_generator(3)
-        self.tracker.update(initial_availabilities, datetime.now())
+        now_2 = _t(1)
+        self.tracker.update(dict(initial_availabilities), now_2)
+        self.assertFalse(self.tracker.has_new_availabilities())
+        self.assertFalse(self.tracker.has_removed_availabilities())
+        self.assertEqual(self.tracker.get_updated_names(), self.tracker.get_current_names())
+        for availability in self.tracker.current_availabilities.values():
+            self.assertEqual(availability.last_time_available, now_2)
 
-        # Modify some availabilities to simulate an update
-        updated_availabilities: dict = dict(list(initial_availabilities.items())[0:2])
-        for key in updated_availabilities.keys():
-            copy = updated_availabilities[key].model_copy(deep=True)
-            copy.last_time_available = datetime.now()
-            updated_availabilities[key] = copy
+    def test_get_current_names_cached_until_update(self):
+        self.tracker.update(cached_availabilities_generator(3), _t(0))
+        names = self.tracker.get_current_names()
+        self.assertIs(self.tracker.get_current_names(), names)
 
-        self.tracker.update(updated_availabilities, datetime.now())
-        self.assertTrue(self.tracker.has_updated_availabilities())
+        self.tracker.update(cached_availabilities_generator(0), _t(1))
+        self.assertEqual(self.tracker.get_current_names(), set())
 
-    def test_has_removed_availabilities_with_update(self):
-        # Setup initial state
-        initial_availabilities = availabilities_generator(3)
-        self.tracker.update(initial_availabilities, datetime.now())
+    def test_current_regions_with_update(self):
+        initial_availabilities = cached_availabilities_generator(3)
+        self.tracker.update(initial_availabilities, _t(0))
+        self.assertEqual(self.tracker.current_regions,
+                         {instance_type.region for instance_type in initial_availabilities})
 
-        # Update with fewer availabilities to simulate removal
-        removed_availabilities = dict(list(initial_availabilities.items())[0:1])
-        self.tracker.update(removed_availabilities, datetime.now())
-        self.assertTrue(self.tracker.has_removed_availabilities())
+        self.tracker.update(cached_availabilities_generator(0), _t(1))
+        self.assertEqual(self.tracker.current_regions, set())
 
 
 class TestInstanceTypeAndAvailability(unittest.TestCase):
 
-    def test_instance_type_initialization(self):
-        instance_type = InstanceType(name="Type1", description="Description1", region="Region1")
-        self.assertEqual(instance_type.name, "Type1")
-        self.assertEqual(instance_type.description, "Description1")
-        self.assertEqual(instance_type.region, "Region1")
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.type_fields = {"name": "Type1", "description": "Description1", "region": "Region1"}
+        cls.instance_type = InstanceType.get_or_create(**cls.type_fields)
+
+    def test_instance_type_get_or_create(self):
+        # The shared instance type holds exactly the given fields, and is returned again for the same fields
+        self.assertEqual(asdict(self.instance_type), self.type_fields)
+        self.assertIs(InstanceType.get_or_create(**self.type_fields), self.instance_type)
+        self.assertIsNot(InstanceType.get_or_create(**{**self.type_fields, "region": "Region2"}), self.instance_type)
 
     def test_instance_availability_methods(self):
-        instance_type = InstanceType(name="Type1", description="Description1", region="Region1")
-        now = datetime.now()
-        availability = InstanceAvailability(instance_type=instance_type, start_time=now, last_time_available=now)
-        self.assertEqual(availability.instance_type, instance_type)
+        now = _t(0)
+        availability = InstanceAvailability(instance_type=self.instance_type, start_time=now, last_time_available=now)
+        self.assertEqual(availability.instance_type, self.instance_type)
         self.assertEqual(availability.get_duration(), timedelta(0))
         # More assertions for methods like update, get_duration, etc.
 